@@ -1,5 +1,5 @@
-import React, { useState, useEffect, useRef } from 'react';
-import { allocatePaycheck } from '../lib/allocations';
+import React, { useState, useEffect, useMemo, useRef } from 'react';
+import { allocatePaycheck, totalAllocated } from '../lib/allocations';
 import { trackEvent } from '../lib/analytics';
 import { getThemeColors, type Theme } from '../lib/theme';
 import { formatCurrency } from '../lib/formatters';
@@ -39,6 +39,12 @@ export default function Dashboard({
   const percentApplyLabel =
     percentApply === 'gross' ? 'Gross paycheck' : 'Paycheck remainder after bills';
 
+  // Serialize the raw details once per result, not on every keystroke while they're open
+  const rawDetails = useMemo(
+    () => (showDetails && lastResult ? JSON.stringify(lastResult, null, 2) : ''),
+    [showDetails, lastResult]
+  );
+
   // Sync with external result changes (e.g., when switching back to this tab)
   useEffect(() => {
     if (initialResult) {
@@ -406,7 +412,7 @@ export default function Dashboard({
                   🏠 − Bills allocated ({lastResult.bills.length})
                 </span>
                 <strong style={{ fontSize: 14, color: 'rgba(255,180,180,1)' }}>
-                  −{formatCurrency(lastResult.bills.reduce((sum, b) => sum + b.allocated, 0))}
+                  −{formatCurrency(totalAllocated(lastResult.bills))}
                 </strong>
               </div>
               <div
@@ -439,7 +445,7 @@ export default function Dashboard({
                   🎯 − Goals allocated ({lastResult.goals.length})
                 </span>
                 <strong style={{ fontSize: 14, color: 'rgba(255,180,180,1)' }}>
-                  −{formatCurrency(lastResult.goals.reduce((sum, g) => sum + g.allocated, 0))}
+                  −{formatCurrency(totalAllocated(lastResult.goals))}
                 </strong>
               </div>
               <div
@@ -1013,7 +1019,7 @@ export default function Dashboard({
                 border: `1px solid ${colors.border}`,
               }}
             >
-              {JSON.stringify(lastResult, null, 2)}
+              {rawDetails}
             </pre>
           ) : null}
         </div>
@@ -0,0 +1,167 @@
+/**
+ * Numeric core of the waterfall allocation.
+ *
+ * These functions only see parallel Float64Array/Int8Array buffers and plain numbers,
+ * so the loops stay monomorphic and free of object property lookups. All bookkeeping
+ * (names, dates, urgency, output objects) lives in allocations.ts.
+ *
+ * Money is always whole cents. Float64 represents every integer below 2^53 exactly,
+ * so min/add/subtract on these buffers never drift and totals always reconcile.
+ */
+
+/** Goal kind encoding used by the `kinds` buffer. */
+export const GOAL_PERCENT = 0;
+export const GOAL_FIXED = 1;
+export type GoalKind = typeof GOAL_PERCENT | typeof GOAL_FIXED;
+
+/**
+ * Fund each slot in order from a single pool of money.
+ *
+ * Written as a prefix sum rather than a running balance:
+ * allocated[i] = min(required[i], max(0, available - sum(required[0..i-1]))).
+ * Once the prefix passes `available` every later slot gets 0, so the loop stops
+ * there and fills the tail directly instead of visiting each remaining slot.
+ *
+ * @param available - Money in the pool
+ * @param required - Amount needed per slot
+ * @param allocated - Output buffer, same length as `required`
+ * @param remaining - Output buffer for the per-slot shortfall, same length as `required`
+ * @returns Money left in the pool after every slot has been visited
+ */
+export function fundInOrder(
+  available: number,
+  required: Float64Array,
+  allocated: Float64Array,
+  remaining: Float64Array
+): number {
+  const n = required.length;
+  let fundedBefore = 0;
+  for (let i = 0; i < n; i++) {
+    const left = available - fundedBefore;
+    if (left <= 0) {
+      allocated.fill(0, i, n);
+      remaining.set(required.subarray(i), i);
+      return 0;
+    }
+    const need = required[i];
+    const alloc = Math.min(need, left);
+    allocated[i] = alloc;
+    remaining[i] = need - alloc;
+    fundedBefore += need;
+  }
+  return Math.max(0, available - fundedBefore);
+}
+
+/**
+ * Top up urgent slots from a second pool, in order, until the pool runs dry.
+ *
+ * @param extra - Money in the second pool
+ * @param urgent - 1 for slots that should be topped up, 0 otherwise
+ * @param allocated - Per-slot allocation, updated in place
+ * @param remaining - Per-slot shortfall, updated in place
+ * @returns Money left in the pool
+ */
+export function fundUrgent(
+  extra: number,
+  urgent: Uint8Array,
+  allocated: Float64Array,
+  remaining: Float64Array
+): number {
+  const n = remaining.length;
+  let pool = extra;
+  for (let i = 0; i < n && pool > 0; i++) {
+    const need = remaining[i];
+    if (urgent[i] === 1 && need > 0) {
+      const alloc = Math.min(pool, need);
+      allocated[i] += alloc;
+      remaining[i] = need - alloc;
+      pool -= alloc;
+    }
+  }
+  return pool;
+}
+
+/**
+ * Fully fund every slot whose whole shortfall still fits in the pool, in order.
+ *
+ * @param extra - Money in the pool
+ * @param allocated - Per-slot allocation, updated in place
+ * @param remaining - Per-slot shortfall, updated in place
+ * @returns Money left in the pool
+ */
+export function completeBills(
+  extra: number,
+  allocated: Float64Array,
+  remaining: Float64Array
+): number {
+  const n = remaining.length;
+  let pool = extra;
+  for (let i = 0; i < n && pool > 0; i++) {
+    const need = remaining[i];
+    if (need > 0 && pool >= need) {
+      allocated[i] += need;
+      pool -= need;
+      remaining[i] = 0;
+    }
+  }
+  return pool;
+}
+
+/**
+ * Split `cap` cents across goals in proportion to what each desires.
+ *
+ * When every goal can be funded in full (the common case) the desires are copied
+ * across in one bulk `set`. Otherwise this is largest-remainder (Hamilton)
+ * apportionment: every goal first gets floor(desired * cap / desiredTotal), then the
+ * cents lost to flooring (fewer than one per goal) go one each to the goals with the
+ * largest fractional remainders, ties going to the earlier goal. The allocations
+ * always sum to exactly `cap`, and no goal is favoured just for being first.
+ *
+ * @param desired - Desired cents per goal
+ * @param desiredTotal - Sum of `desired` (must be > 0)
+ * @param cap - Cents available to goals (0 < cap <= desiredTotal)
+ * @param allocated - Output buffer, same length as `desired`
+ */
+export function apportionCents(
+  desired: Float64Array,
+  desiredTotal: number,
+  cap: number,
+  allocated: Float64Array
+): void {
+  if (cap >= desiredTotal) {
+    allocated.set(desired);
+    return;
+  }
+  const n = desired.length;
+  // Fractional remainders, scaled by desiredTotal so they are whole numbers below it
+  const remainder = new Float64Array(n);
+  let residue = cap;
+  if (desiredTotal * cap <= Number.MAX_SAFE_INTEGER) {
+    // desired[i] <= desiredTotal, so every desired[i] * cap is an exact double here
+    for (let i = 0; i < n; i++) {
+      const scaled = desired[i] * cap;
+      const share = Math.floor(scaled / desiredTotal);
+      allocated[i] = share;
+      remainder[i] = scaled - share * desiredTotal;
+      residue -= share;
+    }
+  } else {
+    // Products past 2^53 (roughly $950k desired against $950k available) would round
+    // as doubles, so split in BigInt. Shares and remainders come back below 2^53.
+    const total = BigInt(desiredTotal);
+    const capBig = BigInt(cap);
+    for (let i = 0; i < n; i++) {
+      const scaled = BigInt(desired[i]) * capBig;
+      const share = Number(scaled / total);
+      allocated[i] = share;
+      remainder[i] = Number(scaled % total);
+      residue -= share;
+    }
+  }
+  if (residue <= 0) return;
+
+  const order = new Uint32Array(n);
+  for (let i = 0; i < n; i++) order[i] = i;
+  order.sort((a, b) => remainder[b] - remainder[a] || a - b);
+  for (let k = 0; k < residue; k++) allocated[order[k]] += 1;
+}
@@ -1,5 +1,14 @@
 import type { BILL_CADENCES, PAY_FREQUENCIES, BonusIncome } from './types';
 import { daysBetweenUTC } from './dateUtils';
+import {
+  GOAL_FIXED,
+  GOAL_PERCENT,
+  apportionCents,
+  completeBills,
+  fundInOrder,
+  fundUrgent,
+} from './allocationKernel';
+import type { GoalKind } from './allocationKernel';
 
 type BillInput = {
   name?: string;
@@ -53,32 +62,89 @@ export type AllocationResult = {
 };
 
 /**
- * Round a number to 2 decimal places for currency display.
+ * Just the totals of an allocation, for views that don't list individual bills or goals.
+ */
+export type AllocationTotals = {
+  bills_allocated: number;
+  goals_allocated: number;
+  guilt_free: number;
+  meta: AllocationResult['meta'];
+};
+
+/**
+ * Convert a dollar amount to whole cents.
  *
  * PRECISION NOTES:
- * - Uses standard IEEE 754 floating-point arithmetic
- * - Precision is maintained throughout calculations, rounded only at output
- * - Cumulative errors typically < $0.01 for amounts under $100,000
- * - For high-precision requirements (hedge funds, accounting systems),
- *   consider using a decimal library like decimal.js or big.js
- *
- * SUFFICIENT FOR:
- * ✅ Personal budgeting (<$10K/month paychecks)
- * ✅ Small business payroll (<$50K/month)
- * ✅ Standard consumer finance applications
+ * - Every amount is rounded to cents exactly once, on the way in
+ * - All allocation math then runs on whole cents, which IEEE 754 doubles
+ *   represent exactly up to $90 trillion
+ * - Bills + goals + guilt-free always add up to paycheck + bonuses to the cent
+ * - Proportional goal splits hand out leftover cents explicitly, so no
+ *   rounding gap has to be patched afterwards
  *
  * LIMITATIONS:
- * ⚠️ Not suitable for high-frequency trading or scientific calculations
- * ⚠️ Avoid using for legal/tax calculations requiring exact cent precision
+ * ⚠️ Percent goals and prorated bills round to the nearest cent, so they can
+ *    differ by $0.01 from pencil-and-paper math on fractional cents
+ *
+ * @param x - Dollar amount
+ * @returns Amount in whole cents
+ * @example
+ * toCents(10.567) // 1057
+ * toCents(0.1 + 0.2) // 30
+ * toCents(1.005) // 101 (1.005 * 100 is 100.49999999999999 in binary)
+ */
+function toCents(x: number): number {
+  return roundCents(x * 100);
+}
+
+/**
+ * Round a fractional number of cents to a whole cent, half up.
+ *
+ * Scaling by (1 + Number.EPSILON) first nudges values that sit one rounding error
+ * below a half (like 100.49999999999999) up to it, so amounts round the way they
+ * read in decimal. It is one multiply, so it stays as cheap as a bare Math.round.
+ */
+function roundCents(cents: number): number {
+  return Math.round(cents * (1 + Number.EPSILON));
+}
+
+/**
+ * Convert whole cents back to dollars for output.
+ */
+function fromCents(cents: number): number {
+  return cents / 100;
+}
+
+/**
+ * Validate a bill amount or goal value once, as it is packed.
+ * Missing values count as 0; anything else must be a finite, non-negative number
+ * so the allocation kernel can rely on that without re-checking.
+ *
+ * @throws Error naming the offending bill or goal
+ */
+function readAmount(value: number | undefined, kind: 'bill' | 'goal', name?: string): number {
+  if (value === undefined) return 0;
+  if (typeof value !== 'number' || !Number.isFinite(value) || value < 0) {
+    const field = kind === 'bill' ? 'amount' : 'value';
+    throw new Error(`${kind} "${name ?? ''}" ${field} must be a non-negative number`);
+  }
+  return value;
+}
+
+/**
+ * Total the `allocated` amounts of bills or goals.
+ * Sums in whole cents so the total always matches the itemized amounts exactly
+ * (plain float addition can drift, e.g. 0.1 + 0.2 = 0.30000000000000004).
  *
- * @param x - The number to round
- * @returns Number rounded to 2 decimal places
+ * @param items - Allocated bills or goals from an AllocationResult
+ * @returns Total allocated, in dollars
  * @example
- * _round2(10.567) // 10.57
- * _round2(0.1 + 0.2) // 0.3 (not 0.30000000000000004)
+ * totalAllocated(result.bills) // 1234.56
  */
-function _round2(x: number): number {
-  return Math.round(x * 100) / 100;
+export function totalAllocated(items: ReadonlyArray<{ allocated: number }>): number {
+  let cents = 0;
+  for (const item of items) cents += toCents(item.allocated);
+  return fromCents(cents);
 }
 
 /**
@@ -155,7 +221,8 @@ const calculateBillPortionNeeded = (
   // Otherwise use time-based estimation
   const cadenceDays = daysPerCadence[cadence as keyof typeof daysPerCadence] ?? 30;
   if (cadenceDays <= 0) return amount;
-  const ratio = daysAhead / cadenceDays;
+  // Clamp at 0: a next paycheck date in the past must not produce a negative requirement
+  const ratio = Math.max(0, daysAhead / cadenceDays);
   return Math.min(amount, amount * ratio);
 };
 
@@ -167,7 +234,8 @@ const getExpectedBonus = (bonus: BonusIncome, daysAhead: number): number => {
   const cadenceDays = daysPerCadence[bonus.cadence as keyof typeof daysPerCadence];
   if (!cadenceDays || cadenceDays <= 0) return 0;
   const expected = (bonus.range.min + bonus.range.max) / 2;
-  const ratio = Math.min(1, daysAhead / cadenceDays);
+  // A next paycheck date in the past must not turn expected income negative
+  const ratio = Math.max(0, Math.min(1, daysAhead / cadenceDays));
   return expected * ratio;
 };
 
@@ -212,80 +280,54 @@ const getDaysUntilDue = (dueDate: Date, currentDate: Date): number => {
 };
 
 /**
- * Allocate a paycheck across bills and goals using the waterfall method.
- *
- * ALLOCATION STRATEGY (waterfall approach):
- * 1. Parse inputs and normalize legacy formats (dueDay → nextDueDate)
- * 2. Prioritize bills by urgency (due before next paycheck, then soonest first)
- * 3. Allocate baseline funds (minimum paycheck + expected bonuses) to bills
- * 4. Allocate extra funds (above minimum):
- *    a. First to urgent bills (due before next paycheck)
- *    b. Then to complete partially-funded bills
- *    c. Remainder flows to goals
- * 5. Calculate goal desires (percent of gross or remainder)
- * 6. Proportionally allocate remaining to goals with fair rounding
- * 7. Return guilt-free spending amount
- *
- * @param paycheckAmount - Gross paycheck amount (must be >= 0)
- * @param bills - List of recurring bills with amounts and cadences
- * @param goals - List of savings/investment goals (percent or fixed amount)
- * @param options - Configuration for allocation behavior
- * @returns Detailed allocation breakdown with guilt-free spending amount
- * @throws Error if paycheckAmount is negative
- *
- * @example
- * ```ts
- * const result = allocatePaycheck(2000,
- *   [{ name: 'Rent', amount: 1000, cadence: 'monthly', nextDueDate: '2025-02-01' }],
- *   [{ name: 'Savings', type: 'percent', value: 10 }],
- *   { percentApply: 'gross', nextPaycheckDate: '2025-01-31' }
- * )
- * console.log(result.guilt_free) // Amount available for guilt-free spending
- * ```
+ * Bills packed into parallel arrays, sorted into funding order.
+ * Index i in every field refers to the same bill; `required` is in cents.
+ * Plans are cached and shared between calls (see getBillPlan), so treat them as read-only.
  */
-export function allocatePaycheck(
-  paycheckAmount: number,
-  bills: BillInput[] = [],
-  goals: GoalInput[] = [],
-  options: AllocationOptions = {}
-): AllocationResult {
-  if (paycheckAmount < 0) throw new Error('paycheck_amount must be non-negative');
-
-  // ========== PHASE 1: Parse and Normalize Inputs ==========
-  const percentApply = options.percentApply ?? 'gross';
-  const payFrequency = options.payFrequency;
-  const paycheckRange = options.paycheckRange ?? { min: paycheckAmount, max: paycheckAmount };
-  const bonuses = options.bonuses ?? [];
-  const currentDate = options.currentDate ?? new Date();
-  const nextPaycheckDate = options.nextPaycheckDate ? new Date(options.nextPaycheckDate) : null;
-
-  // Calculate days until next paycheck for prorating
-  const daysUntilNextPaycheck = nextPaycheckDate
-    ? getDaysUntilDue(nextPaycheckDate, currentDate)
-    : options.upcomingDays ?? getDaysPerPaycheck(payFrequency);
-
-  // Baseline = minimum paycheck amount (or actual if below minimum)
-  const minimum = paycheckRange.min > 0 ? paycheckRange.min : paycheckAmount;
-  const baseline = Math.min(paycheckAmount, minimum);
-  const extra = Math.max(0, paycheckAmount - minimum);
-
-  // Calculate expected bonus income for this period
-  const expectedBonuses = bonuses.reduce(
-    (sum, bonus) => sum + getExpectedBonus(bonus, daysUntilNextPaycheck),
-    0
-  );
-
-  // Available funds = baseline + expected bonuses
-  let availableFunds = baseline + expectedBonuses;
+type PackedBills = {
+  names: string[];
+  required: Float64Array;
+  daysUntilDue: (number | undefined)[];
+  urgent: Uint8Array;
+};
 
-  // ========== PHASE 2: Normalize and Prioritize Bills ==========
-  type BillWithPriority = BillInput & {
-    daysUntilDue?: number;
-    isUrgent: boolean;
-    sortKey: number; // Lower = more urgent
-  };
+/**
+ * Goals packed into parallel arrays, in input order.
+ * `desired` is in cents; `rawValues` keeps the caller's value (possibly undefined)
+ * for the output.
+ */
+type PackedGoals = {
+  names: string[];
+  kinds: Int8Array;
+  rawValues: (number | undefined)[];
+  desired: Float64Array;
+  desiredTotal: number;
+};
 
-  const billsWithPriority: BillWithPriority[] = bills.map((b) => {
+/**
+ * Normalize bills, sort them by priority and compute what each one needs this paycheck.
+ *
+ * Sorting: urgent bills first (due before next paycheck), then soonest due,
+ * then larger bills first for the same priority (helps user cover big obligations).
+ */
+const packBills = (
+  bills: BillInput[],
+  currentDate: Date,
+  nextPaycheckDate: Date | null,
+  daysAhead: number,
+  payFrequency?: (typeof PAY_FREQUENCIES)[number]
+): PackedBills => {
+  const n = bills.length;
+  // Numeric columns are pre-sized typed arrays; other columns are appended in order.
+  // (new Array(n) would leave V8 with a holey array, which stays slower for its lifetime.)
+  const daysUntilDueIn: (number | undefined)[] = [];
+  const order: number[] = [];
+  const urgentIn = new Uint8Array(n);
+  const sortKeys = new Float64Array(n);
+  const amounts = new Float64Array(n);
+
+  for (let i = 0; i < n; i++) {
+    const b = bills[i];
     // Convert legacy dueDay to nextDueDate for unified processing
     const nextDueDate = b.nextDueDate ?? convertDueDayToNextDueDate(b, currentDate);
 
@@ -302,163 +344,605 @@ export function allocatePaycheck(
       }
     }
 
-    // Sorting: Urgent bills first (sortKey < 1000), then by days until due
-    // Non-urgent bills get sortKey >= 1000
-    const sortKey = isUrgent ? daysUntilDue ?? 999 : 1000 + (daysUntilDue ?? 999);
-
-    return {
-      ...b,
-      daysUntilDue,
-      isUrgent,
-      sortKey,
-    };
-  });
+    daysUntilDueIn.push(daysUntilDue);
+    order.push(i);
+    urgentIn[i] = isUrgent ? 1 : 0;
+    amounts[i] = readAmount(b.amount, 'bill', b.name);
+    // Urgent bills get sortKey < 1000, non-urgent bills get sortKey >= 1000
+    sortKeys[i] = isUrgent ? daysUntilDue ?? 999 : 1000 + (daysUntilDue ?? 999);
+  }
 
-  // Sort by priority: urgent + soonest first, then by amount (largest first for same priority)
-  billsWithPriority.sort((a, b) => {
-    if (a.sortKey !== b.sortKey) {
-      return a.sortKey - b.sortKey; // Primary: urgency
+  order.sort((a, b) => {
+    if (sortKeys[a] !== sortKeys[b]) {
+      return sortKeys[a] - sortKeys[b]; // Primary: urgency
     }
-    // Secondary: larger bills first (helps user cover big obligations)
-    return (b.amount ?? 0) - (a.amount ?? 0);
+    return amounts[b] - amounts[a]; // Secondary: larger bills first
   });
 
-  // ========== PHASE 3: Allocate to Bills (Single Optimized Pass) ==========
-  const billsOut: AllocatedBill[] = [];
+  const packed: PackedBills = {
+    names: [],
+    required: new Float64Array(n),
+    daysUntilDue: [],
+    urgent: new Uint8Array(n),
+  };
+  for (let k = 0; k < n; k++) {
+    const i = order[k];
+    packed.names.push(bills[i].name ?? '');
+    packed.daysUntilDue.push(daysUntilDueIn[i]);
+    packed.urgent[k] = urgentIn[i];
+    packed.required[k] = toCents(
+      calculateBillPortionNeeded(
+        amounts[i],
+        bills[i].cadence ?? 'monthly',
+        daysAhead,
+        daysUntilDueIn[i],
+        payFrequency
+      )
+    );
+  }
+  return packed;
+};
 
-  // First pass: Allocate baseline to bills in priority order
-  for (const b of billsWithPriority) {
-    const cadence = b.cadence ?? 'monthly';
-    const amount = Number(b.amount ?? 0);
+const BILL_PLAN_CACHE_SIZE = 64;
 
-    // Calculate required amount for this bill
-    const required = calculateBillPortionNeeded(
-      amount,
-      cadence,
-      daysUntilNextPaycheck,
-      b.daysUntilDue,
-      payFrequency
-    );
+/** Most recently used bill plans, oldest first (Map preserves insertion order). */
+const billPlanCache = new Map<string, PackedBills>();
+
+/**
+ * One input value as a cache key part. Strings are quoted and everything else goes
+ * through String(), so values of different types never collide: 10 vs '10', NaN vs
+ * 'NaN', null vs undefined. Validation then can't depend on whether the cache is warm.
+ */
+const keyPart = (value: unknown): string =>
+  typeof value === 'string' ? JSON.stringify(value) : String(value);
 
-    // Allocate from available baseline funds
-    const alloc = Math.min(availableFunds, required);
-    availableFunds -= alloc;
-
-    billsOut.push({
-      name: b.name ?? '',
-      required,
-      allocated: alloc,
-      remaining: required - alloc,
-      daysUntilDue: b.daysUntilDue,
-      isUrgent: b.isUrgent,
-    });
+/**
+ * Everything packBills() reads, as a string. Dates are reduced to the calendar days
+ * the plan depends on, so recalculating later the same day still hits the cache.
+ */
+const billPlanKey = (
+  bills: BillInput[],
+  currentDate: Date,
+  nextPaycheckDate: Date | null,
+  daysAhead: number,
+  payFrequency?: (typeof PAY_FREQUENCIES)[number]
+): string => {
+  let key = [
+    currentDate.getFullYear(),
+    currentDate.getMonth(),
+    currentDate.getDate(),
+    currentDate.getUTCFullYear(),
+    currentDate.getUTCMonth(),
+    currentDate.getUTCDate(),
+    nextPaycheckDate?.getTime() ?? '',
+    daysAhead,
+    payFrequency ?? '',
+  ].join(',');
+  for (const b of bills) {
+    key +=
+      `|${keyPart(b.name ?? '')},${keyPart(b.amount)},${keyPart(b.cadence)}` +
+      `,${keyPart(b.dueDay)},${keyPart(b.nextDueDate)}`;
   }
+  return key;
+};
 
-  // ========== PHASE 4: Allocate Extra Funds Strategically ==========
-  // Strategy: Prioritize urgent bills, then complete partially-funded bills
-  let extraRemaining = extra;
-
-  // Pass 1: Fund urgent bills first (reduces stress)
-  for (const bill of billsOut) {
-    if (bill.isUrgent && bill.remaining > 0 && extraRemaining > 0) {
-      const additionalAlloc = Math.min(extraRemaining, bill.remaining);
-      bill.allocated += additionalAlloc;
-      bill.remaining -= additionalAlloc;
-      extraRemaining -= additionalAlloc;
-    }
+/**
+ * packBills() with a small LRU cache in front of it.
+ *
+ * The bill plan doesn't depend on the paycheck amount, so recalculating the same
+ * profile with a different paycheck (or the same one again) skips the date parsing,
+ * due-date math and sorting. The key is built from bill contents, not identity,
+ * so editing a bill in place can never return a stale plan.
+ */
+const getBillPlan = (
+  bills: BillInput[],
+  currentDate: Date,
+  nextPaycheckDate: Date | null,
+  daysAhead: number,
+  payFrequency?: (typeof PAY_FREQUENCIES)[number]
+): PackedBills => {
+  const key = billPlanKey(bills, currentDate, nextPaycheckDate, daysAhead, payFrequency);
+  const cached = billPlanCache.get(key);
+  if (cached) {
+    // Refresh recency
+    billPlanCache.delete(key);
+    billPlanCache.set(key, cached);
+    return cached;
   }
 
-  // Pass 2: Complete bills that can be fully funded (satisfying completion)
-  for (const bill of billsOut) {
-    if (bill.remaining > 0 && extraRemaining >= bill.remaining) {
-      const additionalAlloc = bill.remaining;
-      bill.allocated += additionalAlloc;
-      bill.remaining = 0;
-      extraRemaining -= additionalAlloc;
-    }
+  const plan = packBills(bills, currentDate, nextPaycheckDate, daysAhead, payFrequency);
+  billPlanCache.set(key, plan);
+  if (billPlanCache.size > BILL_PLAN_CACHE_SIZE) {
+    billPlanCache.delete(billPlanCache.keys().next().value as string);
   }
+  return plan;
+};
 
-  // Remaining funds after all bill allocation
-  const remainingAfterBills = availableFunds + extraRemaining;
-
-  // ========== PHASE 5: Calculate Goal Desires ==========
-  const baseForPercent =
-    percentApply === 'gross'
-      ? baseline + expectedBonuses + extra // Use full paycheck for percent calculation
-      : remainingAfterBills;
-
-  const goalsDesired: AllocatedGoal[] = goals.map((g) => {
-    const gtype = g.type ?? 'percent';
-    let desired = 0;
-    if (gtype === 'percent') {
-      const pct = Number(g.value ?? 0) / 100;
-      desired = pct * baseForPercent;
-    } else {
-      desired = Number(g.value ?? 0);
-    }
-    return {
-      name: g.name ?? '',
-      type: gtype,
-      value: g.value,
-      desired,
-      allocated: 0,
-    };
-  });
+const goalKind = (g: GoalInput): GoalKind =>
+  (g.type ?? 'percent') === 'percent' ? GOAL_PERCENT : GOAL_FIXED;
 
-  // ========== PHASE 6: Allocate to Goals Proportionally ==========
-  const desiredTotal = goalsDesired.reduce((s, g) => s + g.desired, 0);
-  const cap = Math.min(desiredTotal, remainingAfterBills);
+/**
+ * How many cents a goal of `kind` wants.
+ * Percent goals take `value`% of the base, passed in as `percentBase` = base cents / 100
+ * so callers work it out once rather than per goal; the result is rounded to the
+ * nearest cent. Fixed goals want `value` as-is.
+ */
+const goalDesiredCents = (kind: GoalKind, value: number, percentBase: number): number =>
+  kind === GOAL_PERCENT ? roundCents(value * percentBase) : toCents(value);
 
-  let guiltFree = remainingAfterBills;
+/**
+ * Pack goals into parallel arrays and compute what each one wants, in one pass.
+ */
+const packGoals = (goals: GoalInput[], baseCents: number): PackedGoals => {
+  const n = goals.length;
+  const packed: PackedGoals = {
+    names: [],
+    kinds: new Int8Array(n),
+    rawValues: [],
+    desired: new Float64Array(n),
+    desiredTotal: 0,
+  };
+  const percentBase = baseCents / 100;
+  let desiredTotal = 0;
+  for (let i = 0; i < n; i++) {
+    const g = goals[i];
+    const kind = goalKind(g);
+    const desired = goalDesiredCents(kind, readAmount(g.value, 'goal', g.name), percentBase);
+    packed.names.push(g.name ?? '');
+    packed.kinds[i] = kind;
+    packed.rawValues.push(g.value);
+    packed.desired[i] = desired;
+    desiredTotal += desired;
+  }
+  packed.desiredTotal = desiredTotal;
+  return packed;
+};
 
-  if (desiredTotal <= 0 || cap <= 0) {
-    // No goals or no funds remaining
-    for (const g of goalsDesired) g.allocated = 0;
-    guiltFree = remainingAfterBills;
-  } else {
-    // Allocate proportionally
-    const factor = cap / desiredTotal;
-    let allocatedSum = 0;
-
-    for (let i = 0; i < goalsDesired.length; i++) {
-      const g = goalsDesired[i];
-      // Calculate allocation maintaining precision
-      const alloc = g.desired * factor;
-      g.allocated = alloc;
-      allocatedSum += alloc;
-    }
+/** Goals after funding, still packed: desires and allocations in cents. */
+type FundedGoals = { packed: PackedGoals; allocated: Float64Array; allocatedCents: number };
 
-    // Distribute rounding error proportionally (fair distribution)
-    const roundingGap = cap - allocatedSum;
-    if (Math.abs(roundingGap) >= 0.001 && goalsDesired.length > 0) {
-      // Give rounding error to largest goal (most fair distribution)
-      const largestGoal = goalsDesired.reduce((max, g) => (g.desired > max.desired ? g : max));
-      largestGoal.allocated += roundingGap;
-    }
+/**
+ * FundedGoals for a call without goals. Shared and never modified: only
+ * toAllocationResult() reads it, and that always builds new output arrays.
+ */
+const NO_GOALS: FundedGoals = {
+  packed: {
+    names: [],
+    kinds: new Int8Array(0),
+    rawValues: [],
+    desired: new Float64Array(0),
+    desiredTotal: 0,
+  },
+  allocated: new Float64Array(0),
+  allocatedCents: 0,
+};
 
-    guiltFree = remainingAfterBills - cap;
+/**
+ * Fund goals from what is left after bills, proportionally when it isn't enough.
+ *
+ * @param goals - Goals in input order
+ * @param baseCents - Amount percent goals are applied to
+ * @param availableCents - Money left after bills
+ * @returns Packed goals, cents allocated to each, and their total
+ */
+const allocateGoals = (
+  goals: GoalInput[],
+  baseCents: number,
+  availableCents: number
+): FundedGoals => {
+  const packed = packGoals(goals, baseCents);
+  const allocated = new Float64Array(goals.length);
+
+  const cap = Math.max(0, Math.min(packed.desiredTotal, availableCents));
+  if (cap > 0) {
+    apportionCents(packed.desired, packed.desiredTotal, cap, allocated);
   }
+  // Otherwise no funds remaining: allocated stays all zeros
+
+  return { packed, allocated, allocatedCents: cap };
+};
+
+/**
+ * Picks the amount percent goals apply to, given the gross cents (baseline + bonuses
+ * + extra) and the cents left after bills. One of these is chosen per percentApply
+ * mode when the context is prepared, so funding a paycheck never re-checks the mode.
+ */
+type PercentBase = (grossCents: number, remainingAfterBills: number) => number;
+
+// Use full paycheck for percent calculation
+const grossPercentBase: PercentBase = (grossCents) => grossCents;
+const remainderPercentBase: PercentBase = (_grossCents, remainingAfterBills) => remainingAfterBills;
+
+/**
+ * Everything about an allocation that doesn't depend on the paycheck amount.
+ * Built once per allocatePaycheck() call, or once per batch in allocatePaychecks().
+ */
+type AllocationContext = {
+  percentApply: 'gross' | 'remainder';
+  percentBase: PercentBase;
+  rangeMin: number; // 0 when no paycheck range was given
+  bonusCents: number;
+  packedBills: PackedBills;
+};
+
+/**
+ * PHASE 1 & 2: Parse and normalize inputs, then prioritize bills.
+ */
+const prepareAllocation = (bills: BillInput[], options: AllocationOptions): AllocationContext => {
+  const payFrequency = options.payFrequency;
+  const bonuses = options.bonuses ?? [];
+  const currentDate = options.currentDate ?? new Date();
+  const nextPaycheckDate = options.nextPaycheckDate ? new Date(options.nextPaycheckDate) : null;
+
+  // Calculate days until next paycheck for prorating
+  const daysUntilNextPaycheck = nextPaycheckDate
+    ? getDaysUntilDue(nextPaycheckDate, currentDate)
+    : options.upcomingDays ?? getDaysPerPaycheck(payFrequency);
+
+  // Calculate expected bonus income for this period
+  const bonusCents = toCents(
+    bonuses.reduce((sum, bonus) => sum + getExpectedBonus(bonus, daysUntilNextPaycheck), 0)
+  );
+
+  const percentApply = options.percentApply ?? 'gross';
+
+  return {
+    percentApply,
+    percentBase: percentApply === 'gross' ? grossPercentBase : remainderPercentBase,
+    rangeMin: options.paycheckRange?.min ?? 0,
+    bonusCents,
+    packedBills: getBillPlan(
+      bills,
+      currentDate,
+      nextPaycheckDate,
+      daysUntilNextPaycheck,
+      payFrequency
+    ),
+  };
+};
+
+/**
+ * Where the money stands once bills are funded. All amounts in cents.
+ */
+type BillFunding = {
+  paycheckCents: number;
+  baselineCents: number;
+  extraCents: number;
+  bonusCents: number;
+  extraRemaining: number;
+  remainingAfterBills: number;
+  baseForPercent: number;
+  billAllocated: Float64Array;
+  billRemaining: Float64Array;
+};
+
+/**
+ * PHASES 3 & 4 of the waterfall for one paycheck, given the prepared context.
+ */
+const fundBills = (paycheckAmount: number, context: AllocationContext): BillFunding => {
+  const { bonusCents, packedBills } = context;
+
+  // Baseline = minimum paycheck amount (or actual if below minimum)
+  const minimum = context.rangeMin > 0 ? context.rangeMin : paycheckAmount;
+  const paycheckCents = toCents(paycheckAmount);
+  const minimumCents = toCents(minimum);
+  const baselineCents = Math.min(paycheckCents, minimumCents);
+  const extraCents = Math.max(0, paycheckCents - minimumCents);
+
+  // Available funds = baseline + expected bonuses
+  let availableCents = baselineCents + bonusCents;
+
+  const billCount = packedBills.names.length;
+  const billRequired = packedBills.required;
+  const billAllocated = new Float64Array(billCount);
+  const billRemaining = new Float64Array(billCount);
+
+  let extraRemaining = extraCents;
+
+  if (availableCents + extraCents > 0) {
+    // ========== PHASE 3: Allocate Baseline to Bills in Priority Order ==========
+    availableCents = fundInOrder(availableCents, billRequired, billAllocated, billRemaining);
+
+    // ========== PHASE 4: Allocate Extra Funds Strategically ==========
+    // Strategy: Prioritize urgent bills, then complete partially-funded bills
+
+    // Pass 1: Fund urgent bills first (reduces stress)
+    extraRemaining = fundUrgent(extraRemaining, packedBills.urgent, billAllocated, billRemaining);
+
+    // Pass 2: Complete bills that can be fully funded (satisfying completion)
+    extraRemaining = completeBills(extraRemaining, billAllocated, billRemaining);
+  } else {
+    // Nothing to hand out (zero paycheck, no bonuses): every bill stays unfunded
+    billRemaining.set(billRequired);
+  }
+
+  // Remaining funds after all bill allocation
+  const remainingAfterBills = availableCents + extraRemaining;
+
+  return {
+    paycheckCents,
+    baselineCents,
+    extraCents,
+    bonusCents,
+    extraRemaining,
+    remainingAfterBills,
+    baseForPercent: context.percentBase(
+      baselineCents + bonusCents + extraCents,
+      remainingAfterBills
+    ),
+    billAllocated,
+    billRemaining,
+  };
+};
+
+const buildMeta = (funding: BillFunding): AllocationResult['meta'] => ({
+  paycheck: fromCents(funding.paycheckCents),
+  baseline_from_minimum: fromCents(funding.baselineCents),
+  extra_allocated: fromCents(funding.extraCents - funding.extraRemaining),
+  remaining_after_bills: fromCents(funding.remainingAfterBills),
+  supplemental_income: fromCents(funding.bonusCents),
+});
+
+/**
+ * One allocation in packed form: cent buffers and shared plan data, no per-item objects.
+ * This is what the result cache keeps; toAllocationResult() builds the public shape.
+ */
+type PackedAllocation = {
+  packedBills: PackedBills;
+  funding: BillFunding;
+  goals: FundedGoals;
+};
+
+/**
+ * PHASES 3-6 of the waterfall for one paycheck, given the prepared context.
+ */
+const computeAllocation = (
+  paycheckAmount: number,
+  goals: GoalInput[],
+  context: AllocationContext
+): PackedAllocation => {
+  const funding = fundBills(paycheckAmount, context);
+
+  // ========== PHASE 5 & 6: Calculate Goal Desires and Fund Goals ==========
+  // No goals: skip packing entirely, everything left after bills is guilt-free
+  return {
+    packedBills: context.packedBills,
+    funding,
+    goals:
+      goals.length > 0
+        ? allocateGoals(goals, funding.baseForPercent, funding.remainingAfterBills)
+        : NO_GOALS,
+  };
+};
+
+/**
+ * PHASE 7: Convert to dollars and build the output objects.
+ * Every call returns new objects, so callers are free to modify them.
+ */
+const toAllocationResult = ({
+  packedBills,
+  funding,
+  goals,
+}: PackedAllocation): AllocationResult => {
+  const { billAllocated, billRemaining } = funding;
+  const { packed, allocated } = goals;
 
-  // ========== PHASE 7: Round and Return Results ==========
   return {
-    bills: billsOut.map((b) => ({
-      ...b,
-      required: _round2(b.required),
-      allocated: _round2(b.allocated),
-      remaining: _round2(b.remaining),
+    bills: packedBills.names.map((name, i): AllocatedBill => ({
+      name,
+      required: fromCents(packedBills.required[i]),
+      allocated: fromCents(billAllocated[i]),
+      remaining: fromCents(billRemaining[i]),
+      daysUntilDue: packedBills.daysUntilDue[i],
+      isUrgent: packedBills.urgent[i] === 1,
     })),
-    goals: goalsDesired.map((g) => ({
-      ...g,
-      desired: _round2(g.desired),
-      allocated: _round2(g.allocated),
+    goals: packed.names.map((name, i): AllocatedGoal => ({
+      name,
+      type: packed.kinds[i] === GOAL_FIXED ? 'fixed' : 'percent',
+      value: packed.rawValues[i],
+      desired: fromCents(packed.desired[i]),
+      allocated: fromCents(allocated[i]),
     })),
-    guilt_free: _round2(guiltFree),
-    meta: {
-      paycheck: _round2(paycheckAmount),
-      baseline_from_minimum: _round2(baseline),
-      extra_allocated: _round2(extra - extraRemaining),
-      remaining_after_bills: _round2(remainingAfterBills),
-      supplemental_income: _round2(expectedBonuses),
-    },
+    guilt_free: fromCents(funding.remainingAfterBills - goals.allocatedCents),
+    meta: buildMeta(funding),
   };
+};
+
+/**
+ * PHASES 3-7 of the waterfall for one paycheck, given the prepared context.
+ */
+const allocateWithContext = (
+  paycheckAmount: number,
+  goals: GoalInput[],
+  context: AllocationContext
+): AllocationResult => toAllocationResult(computeAllocation(paycheckAmount, goals, context));
+
+/**
+ * Same waterfall as allocateWithContext, but only the totals are produced.
+ * Goals only need their combined desire here, so they are never packed or split.
+ */
+const totalsWithContext = (
+  paycheckAmount: number,
+  goals: GoalInput[],
+  context: AllocationContext
+): AllocationTotals => {
+  const funding = fundBills(paycheckAmount, context);
+  const { remainingAfterBills } = funding;
+
+  const percentBase = funding.baseForPercent / 100;
+  let desiredTotal = 0;
+  for (const g of goals) {
+    desiredTotal += goalDesiredCents(goalKind(g), readAmount(g.value, 'goal', g.name), percentBase);
+  }
+  const goalsCents = Math.max(0, Math.min(desiredTotal, remainingAfterBills));
+
+  return {
+    bills_allocated: fromCents(
+      funding.baselineCents + funding.bonusCents + funding.extraCents - remainingAfterBills
+    ),
+    goals_allocated: fromCents(goalsCents),
+    guilt_free: fromCents(remainingAfterBills - goalsCents),
+    meta: buildMeta(funding),
+  };
+};
+
+/** Results remembered per bill plan. */
+const RESULT_CACHE_SIZE = 32;
+
+/**
+ * Recent results, grouped by the bill plan they were computed from. Keying on the
+ * plan object means a result can only be reused with the exact same bills and dates,
+ * and results are dropped together with their plan when it leaves billPlanCache.
+ */
+const resultCache = new WeakMap<PackedBills, Map<string, PackedAllocation>>();
+
+/** Everything allocateWithContext() reads besides the bill plan, as a string. */
+const resultKey = (
+  paycheckAmount: number,
+  goals: GoalInput[],
+  context: AllocationContext
+): string => {
+  const { percentApply, rangeMin, bonusCents } = context;
+  let key = `${keyPart(paycheckAmount)},${percentApply},${rangeMin},${bonusCents}`;
+  for (const g of goals) {
+    key += `|${keyPart(g.name ?? '')},${keyPart(g.type)},${keyPart(g.value)}`;
+  }
+  return key;
+};
+
+/**
+ * allocateWithContext() with a small LRU cache in front of it.
+ *
+ * Reactive views recalculate with identical inputs all the time (re-renders,
+ * keystrokes that don't change a value); those calls only rebuild the output objects
+ * from the stored cent buffers. Entries hold no per-item objects, so a cached result
+ * costs a few typed arrays, and callers never share objects with the cache.
+ * Like the bill plan cache, keys are built from contents, never identity.
+ */
+const allocateCached = (
+  paycheckAmount: number,
+  goals: GoalInput[],
+  context: AllocationContext
+): AllocationResult => {
+  let results = resultCache.get(context.packedBills);
+  if (!results) {
+    results = new Map();
+    resultCache.set(context.packedBills, results);
+  }
+
+  const key = resultKey(paycheckAmount, goals, context);
+  const cached = results.get(key);
+  if (cached) {
+    // Refresh recency
+    results.delete(key);
+    results.set(key, cached);
+    return toAllocationResult(cached);
+  }
+
+  const packed = computeAllocation(paycheckAmount, goals, context);
+  results.set(key, packed);
+  if (results.size > RESULT_CACHE_SIZE) {
+    results.delete(results.keys().next().value as string);
+  }
+  return toAllocationResult(packed);
+};
+
+/**
+ * Allocate a paycheck across bills and goals using the waterfall method.
+ *
+ * ALLOCATION STRATEGY (waterfall approach):
+ * 1. Parse inputs and normalize legacy formats (dueDay → nextDueDate)
+ * 2. Prioritize bills by urgency (due before next paycheck, then soonest first)
+ * 3. Allocate baseline funds (minimum paycheck + expected bonuses) to bills
+ * 4. Allocate extra funds (above minimum):
+ *    a. First to urgent bills (due before next paycheck)
+ *    b. Then to complete partially-funded bills
+ *    c. Remainder flows to goals
+ * 5. Calculate goal desires (percent of gross or remainder)
+ * 6. Proportionally allocate remaining to goals with fair rounding
+ * 7. Return guilt-free spending amount
+ *
+ * @param paycheckAmount - Gross paycheck amount (must be >= 0)
+ * @param bills - List of recurring bills with amounts and cadences
+ * @param goals - List of savings/investment goals (percent or fixed amount)
+ * @param options - Configuration for allocation behavior
+ * @returns Detailed allocation breakdown with guilt-free spending amount
+ * @throws Error if paycheckAmount is negative
+ *
+ * @example
+ * ```ts
+ * const result = allocatePaycheck(2000,
+ *   [{ name: 'Rent', amount: 1000, cadence: 'monthly', nextDueDate: '2025-02-01' }],
+ *   [{ name: 'Savings', type: 'percent', value: 10 }],
+ *   { percentApply: 'gross', nextPaycheckDate: '2025-01-31' }
+ * )
+ * console.log(result.guilt_free) // Amount available for guilt-free spending
+ * ```
+ */
+export function allocatePaycheck(
+  paycheckAmount: number,
+  bills: BillInput[] = [],
+  goals: GoalInput[] = [],
+  options: AllocationOptions = {}
+): AllocationResult {
+  if (paycheckAmount < 0) throw new Error('paycheck_amount must be non-negative');
+  return allocateCached(paycheckAmount, goals, prepareAllocation(bills, options));
+}
+
+/**
+ * Allocate several paychecks against the same bills, goals and options.
+ *
+ * Use this for what-if scenarios and planning views (e.g. a year of paychecks).
+ * Due dates, bill requirements, priority order and expected bonuses are worked out
+ * once for the whole batch, and all paychecks share the same current date.
+ * Each result is identical to calling allocatePaycheck() with that amount.
+ *
+ * @param paycheckAmounts - Gross paycheck amounts (each must be >= 0)
+ * @param bills - List of recurring bills with amounts and cadences
+ * @param goals - List of savings/investment goals (percent or fixed amount)
+ * @param options - Configuration for allocation behavior, shared by every paycheck
+ * @returns One allocation result per paycheck, in the same order
+ * @throws Error if any paycheck amount is negative
+ *
+ * @example
+ * ```ts
+ * const results = allocatePaychecks([1800, 2000, 2200], bills, goals, { percentApply: 'gross' })
+ * results.map((r) => r.guilt_free)
+ * ```
+ */
+export function allocatePaychecks(
+  paycheckAmounts: readonly number[],
+  bills: BillInput[] = [],
+  goals: GoalInput[] = [],
+  options: AllocationOptions = {}
+): AllocationResult[] {
+  for (const amount of paycheckAmounts) {
+    if (amount < 0) throw new Error('paycheck_amount must be non-negative');
+  }
+  const context = prepareAllocation(bills, options);
+  return paycheckAmounts.map((amount) => allocateWithContext(amount, goals, context));
+}
+
+/**
+ * Allocate a paycheck like allocatePaycheck(), but return only the totals.
+ *
+ * Skips building a result object per bill and goal, and never splits goals
+ * individually. Use it when a view recalculates often and only shows totals,
+ * such as a guilt-free preview while the user types.
+ *
+ * @param paycheckAmount - Gross paycheck amount (must be >= 0)
+ * @param bills - List of recurring bills with amounts and cadences
+ * @param goals - List of savings/investment goals (percent or fixed amount)
+ * @param options - Configuration for allocation behavior
+ * @returns Bills/goals totals, guilt-free amount and the same meta as allocatePaycheck()
+ * @throws Error if paycheckAmount is negative
+ */
+export function allocatePaycheckTotals(
+  paycheckAmount: number,
+  bills: BillInput[] = [],
+  goals: GoalInput[] = [],
+  options: AllocationOptions = {}
+): AllocationTotals {
+  if (paycheckAmount < 0) throw new Error('paycheck_amount must be non-negative');
+  return totalsWithContext(paycheckAmount, goals, prepareAllocation(bills, options));
 }
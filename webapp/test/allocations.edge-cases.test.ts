@@ -1,5 +1,9 @@
 import { describe, it, expect } from 'vitest';
-import { allocatePaycheck } from '../src/lib/allocations';
+import {
+  allocatePaycheck,
+  allocatePaycheckTotals,
+  totalAllocated as sumAllocated,
+} from '../src/lib/allocations';
 
 describe('allocatePaycheck - edge cases', () => {
   describe('overdue bills', () => {
@@ -56,6 +60,47 @@ describe('allocatePaycheck - edge cases', () => {
       expect(out.bills[0].allocated).toBe(600);
       expect(out.bills[1].allocated).toBe(200);
     });
+
+    it('does not produce negative requirements when next paycheck date is in the past', () => {
+      const out = allocatePaycheck(
+        1000,
+        [{ name: 'Insurance', amount: 2210, cadence: 'quarterly' }],
+        [],
+        { currentDate: new Date(2025, 1, 21), nextPaycheckDate: '2025-02-01' }
+      );
+
+      expect(out.bills[0].required).toBe(0);
+      expect(out.bills[0].allocated).toBe(0);
+      expect(out.guilt_free).toBe(1000);
+    });
+
+    it('reconciles with bonuses when next paycheck date is in the past', () => {
+      const bills = [{ name: 'Phone', amount: 50, cadence: 'every_paycheck' as const }];
+      const options = {
+        currentDate: new Date(2025, 1, 21),
+        nextPaycheckDate: '2025-02-01',
+        paycheckRange: { min: 100, max: 1500 },
+        bonuses: [
+          {
+            name: 'Tips',
+            cadence: 'weekly' as const,
+            range: { min: 100, max: 100 },
+            recurring: true,
+          },
+        ],
+      };
+      const out = allocatePaycheck(1000, bills, [], options);
+      const totals = allocatePaycheckTotals(1000, bills, [], options);
+
+      expect(out.meta.supplemental_income).toBe(0);
+      expect(sumAllocated(out.bills)).toBe(50);
+      expect(out.guilt_free).toBe(950);
+      expect(sumAllocated([...out.bills, { allocated: out.guilt_free }])).toBe(
+        out.meta.paycheck + out.meta.supplemental_income
+      );
+      expect(totals.bills_allocated).toBe(50);
+      expect(totals.guilt_free).toBe(950);
+    });
   });
 
   describe('leap year handling', () => {
@@ -187,6 +232,23 @@ describe('allocatePaycheck - edge cases', () => {
       expect(out.guilt_free).toBe(0);
     });
 
+    it('still funds bills from bonuses when the paycheck is zero', () => {
+      const out = allocatePaycheck(
+        0,
+        [{ name: 'Phone', amount: 50, cadence: 'every_paycheck' }],
+        [],
+        {
+          bonuses: [
+            { name: 'Tips', cadence: 'weekly', range: { min: 100, max: 100 }, recurring: true },
+          ],
+          upcomingDays: 7,
+        }
+      );
+
+      expect(out.bills[0].allocated).toBe(50);
+      expect(out.guilt_free).toBe(50);
+    });
+
     it('handles very small paycheck amounts', () => {
       const out = allocatePaycheck(
         0.01, // 1 cent
@@ -478,6 +540,18 @@ describe('allocatePaycheck - edge cases', () => {
       expect(out.bills[0].allocated).toBe(0.1);
     });
 
+    it('rounds half-cent amounts the way they read in decimal', () => {
+      const out = allocatePaycheck(
+        1.005, // 1.005 * 100 is 100.49999999999999 in binary
+        [],
+        [],
+        { upcomingDays: 30 }
+      );
+
+      expect(out.meta.paycheck).toBe(1.01);
+      expect(out.guilt_free).toBe(1.01);
+    });
+
     it('maintains precision through complex calculations', () => {
       const out = allocatePaycheck(
         1234.56,
@@ -497,5 +571,79 @@ describe('allocatePaycheck - edge cases', () => {
       // Total should equal paycheck (within floating point tolerance)
       expect(Math.abs(totalAllocated - 1234.56)).toBeLessThan(0.01);
     });
+
+    it('splits goal funding to the exact cent when it does not divide evenly', () => {
+      const out = allocatePaycheck(
+        100,
+        [],
+        [
+          { name: 'A', type: 'fixed', value: 100 },
+          { name: 'B', type: 'fixed', value: 100 },
+          { name: 'C', type: 'fixed', value: 100 },
+        ],
+        { upcomingDays: 30 }
+      );
+
+      expect(out.goals.map((g) => g.allocated)).toEqual([33.34, 33.33, 33.33]);
+      expect(out.guilt_free).toBe(0);
+    });
+
+    it('gives leftover cents to the goals with the largest remainders', () => {
+      const out = allocatePaycheck(
+        1,
+        [],
+        [
+          { name: 'Small', type: 'fixed', value: 1 },
+          { name: 'Large', type: 'fixed', value: 2 },
+        ],
+        { upcomingDays: 30 }
+      );
+
+      // Exact shares are 33.33... and 66.66... cents; the spare cent goes to Large
+      expect(out.goals.map((g) => g.allocated)).toEqual([0.33, 0.67]);
+      expect(out.guilt_free).toBe(0);
+    });
+
+    it('breaks exact remainder ties by goal order even for very large amounts', () => {
+      const out = allocatePaycheck(
+        10000000.13,
+        [],
+        [
+          { name: 'A', type: 'fixed', value: 10000000.11 },
+          { name: 'B', type: 'fixed', value: 10000000.15 },
+        ],
+        { upcomingDays: 30 }
+      );
+
+      // Both exact shares are 500000005.5 cents, so the spare cent goes to A. The
+      // products involved are past 2^53, where double arithmetic misranks the tie.
+      expect(out.goals.map((g) => g.allocated)).toEqual([5000000.06, 5000000.07]);
+      expect(out.guilt_free).toBe(0);
+    });
+
+    it('totals allocated amounts without float drift', () => {
+      expect(sumAllocated([{ allocated: 0.1 }, { allocated: 0.2 }])).toBe(0.3);
+      expect(sumAllocated([])).toBe(0);
+    });
+
+    it('reconciles bills, goals and guilt-free to the paycheck in cents', () => {
+      const out = allocatePaycheck(
+        1000,
+        [
+          { name: 'Rent', amount: 1000, cadence: 'monthly' },
+          { name: 'Phone', amount: 85.55, cadence: 'monthly' },
+        ],
+        [{ name: 'Savings', type: 'percent', value: 7.5 }],
+        { upcomingDays: 13 }
+      );
+
+      const cents = (x: number) => Math.round(x * 100);
+      const totalCents =
+        out.bills.reduce((sum, b) => sum + cents(b.allocated), 0) +
+        out.goals.reduce((sum, g) => sum + cents(g.allocated), 0) +
+        cents(out.guilt_free);
+
+      expect(totalCents).toBe(100000);
+    });
   });
 });
@@ -1,5 +1,10 @@
 import { describe, it, expect } from 'vitest'
-import { allocatePaycheck } from '../src/lib/allocations'
+import {
+  allocatePaycheck,
+  allocatePaycheckTotals,
+  allocatePaychecks,
+  totalAllocated
+} from '../src/lib/allocations'
 
 describe('allocatePaycheck', () => {
   it('allocates bills based on upcoming days', () => {
@@ -100,10 +105,50 @@ describe('allocatePaycheck', () => {
     expect(out.guilt_free).toBeGreaterThan(500)
   })
 
+  it('recalculates after a bill is edited in place', () => {
+    const bills = [{ name: 'Rent', amount: 1000, cadence: 'monthly' as const }]
+    const first = allocatePaycheck(1500, bills, [], { upcomingDays: 30 })
+    expect(first.bills[0].required).toBe(1000)
+
+    bills[0].amount = 1200
+    const second = allocatePaycheck(1500, bills, [], { upcomingDays: 30 })
+    expect(second.bills[0].required).toBe(1200)
+    expect(second.guilt_free).toBe(300)
+  })
+
   it('negative paycheck throws', () => {
     expect(() => allocatePaycheck(-100, [], [])).toThrow()
   })
 
+  it('rejects malformed bill amounts and goal values', () => {
+    expect(() =>
+      allocatePaycheck(1000, [{ name: 'Rent', amount: -5, cadence: 'monthly' }], [])
+    ).toThrow('bill "Rent" amount must be a non-negative number')
+    expect(() =>
+      allocatePaycheck(1000, [], [{ name: 'Savings', type: 'fixed', value: Number.NaN }])
+    ).toThrow('goal "Savings" value must be a non-negative number')
+  })
+
+  it('rejects a numeric string even after the same numeric input was cached', () => {
+    const options = { currentDate: new Date(2025, 0, 10), upcomingDays: 14 }
+    const bill = { name: 'Rent', cadence: 'monthly' as const, dueDay: 1 }
+    const goal = { name: 'Savings', type: 'fixed' as const }
+
+    allocatePaycheck(1000, [{ ...bill, amount: 10 }], [{ ...goal, value: 10 }], options)
+
+    expect(() =>
+      allocatePaycheck(1000, [{ ...bill, amount: '10' as unknown as number }], [], options)
+    ).toThrow('bill "Rent" amount must be a non-negative number')
+    expect(() =>
+      allocatePaycheck(
+        1000,
+        [{ ...bill, amount: 10 }],
+        [{ ...goal, value: '10' as unknown as number }],
+        options
+      )
+    ).toThrow('goal "Savings" value must be a non-negative number')
+  })
+
   it('prioritizes bills by due date urgency', () => {
     // Test with bills due on different days - using ISO strings for consistent timezone handling
     const testDate = new Date('2025-01-10')
@@ -259,4 +304,73 @@ describe('allocatePaycheck', () => {
     const fullyFundedCount = out.bills.filter((b) => b.allocated === b.required).length
     expect(fullyFundedCount).toBeGreaterThan(0)
   })
+
+  it('allocates a batch of paychecks the same as one at a time', () => {
+    const bills = [
+      { name: 'Rent', amount: 1200, cadence: 'monthly' as const, dueDay: 1 },
+      { name: 'Phone', amount: 60, cadence: 'every_paycheck' as const }
+    ]
+    const goals = [
+      { name: 'Invest', type: 'percent' as const, value: 10 },
+      { name: 'Trip', type: 'fixed' as const, value: 150 }
+    ]
+    const options = {
+      paycheckRange: { min: 900, max: 2200 },
+      currentDate: new Date(2025, 0, 10),
+      upcomingDays: 14
+    }
+    const paychecks = [0, 900, 1500, 2200]
+
+    const batch = allocatePaychecks(paychecks, bills, goals, options)
+
+    expect(batch).toHaveLength(paychecks.length)
+    paychecks.forEach((amount, i) => {
+      expect(batch[i]).toEqual(allocatePaycheck(amount, bills, goals, options))
+    })
+  })
+
+  it('batch allocation rejects negative paychecks', () => {
+    expect(() => allocatePaychecks([1000, -1], [], [])).toThrow()
+  })
+
+  it('totals-only allocation matches the full result', () => {
+    const bills = [
+      { name: 'Rent', amount: 1200, cadence: 'monthly' as const, dueDay: 1 },
+      { name: 'Phone', amount: 60, cadence: 'every_paycheck' as const }
+    ]
+    const goals = [
+      { name: 'Invest', type: 'percent' as const, value: 30 },
+      { name: 'Trip', type: 'fixed' as const, value: 400 }
+    ]
+    const options = { currentDate: new Date(2025, 0, 10), upcomingDays: 14 }
+
+    for (const paycheck of [0, 500, 1500, 3000]) {
+      const full = allocatePaycheck(paycheck, bills, goals, options)
+      const totals = allocatePaycheckTotals(paycheck, bills, goals, options)
+
+      expect(totals.bills_allocated).toBe(totalAllocated(full.bills))
+      expect(totals.goals_allocated).toBe(totalAllocated(full.goals))
+      expect(totals.guilt_free).toBe(full.guilt_free)
+      expect(totals.meta).toEqual(full.meta)
+    }
+  })
+
+  it('repeated calls are unaffected by mutating a previous result or editing a goal', () => {
+    const bills = [{ name: 'Rent', amount: 1000, cadence: 'monthly' as const, dueDay: 1 }]
+    const goals = [{ name: 'Savings', type: 'fixed' as const, value: 200 }]
+    const options = { currentDate: new Date(2025, 0, 10), upcomingDays: 30 }
+
+    const first = allocatePaycheck(2000, bills, goals, options)
+    first.bills[0].allocated = 0
+    first.goals.pop()
+    first.meta.paycheck = 0
+
+    const second = allocatePaycheck(2000, bills, goals, options)
+    expect(second.bills[0].allocated).toBe(1000)
+    expect(second.goals[0].allocated).toBe(200)
+    expect(second.meta.paycheck).toBe(2000)
+
+    goals[0].value = 300
+    expect(allocatePaycheck(2000, bills, goals, options).goals[0].allocated).toBe(300)
+  })
 })